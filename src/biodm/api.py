@@ -23,6 +23,7 @@ from biodm import Scope, config
 from biodm.basics import CORE_CONTROLLERS, K8sController
 from biodm.components.k8smanifest import K8sManifest
 from biodm.managers import DatabaseManager, KeycloakManager, S3Manager, K8sManager
+from biodm.components import Base
 from biodm.components.controllers import Controller
 from biodm.components.services import UnaryEntityService, CompositeEntityService
 from biodm.error import onerror
@@ -183,7 +184,7 @@ class Api(Starlette):
 
         # Event handlers
         self.add_event_handler("startup", self.onstart)
-        # self.add_event_handler("shutdown", self.on_app_stop)
+        self.add_event_handler("shutdown", self.onstop)
 
         # Error handlers
         self.add_exception_handler(RuntimeError, onerror)
@@ -256,8 +257,19 @@ class Api(Starlette):
     async def onstart(self) -> None:
         """server start event.
         - Setup permission lookup tables
+        - Warm up tables introspection
         - Reinitialize DB in DEBUG mode.
+        - Open DB pool connections.
         """
         PermissionLookupTables.setup_permissions(self)
+        Base.warm()
         if Scope.DEBUG in self.scope:
             await self.db.init_db()
+        await self.db.warm_pool()
+
+    async def onstop(self) -> None:
+        """server stop event.
+        - Release Keycloak HTTP connections.
+        """
+        if hasattr(self, 'kc'):
+            self.kc.close()
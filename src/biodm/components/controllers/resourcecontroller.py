@@ -219,7 +219,7 @@ class ResourceController(EntityController):
         :rtype: List[Any]
         """
         pk_val = [
-            self.table.col(k).type.python_type(
+            self.table.colinfo(k)[1](
                 request.path_params.get(k)
             ) for k in self.table.pk
         ]
@@ -272,7 +272,7 @@ class ResourceController(EntityController):
         fields = fields.split(',') if fields else None
 
         if fields: # User input case, check and raise.
-            fields = set(fields) | self.table.pk
+            fields = set(fields).union(self.table.pk)
             for field in fields:
                 if field not in self.schema.dump_fields.keys():
                     raise DataError(f"Requested field {field} does not exists.")
@@ -1,6 +1,5 @@
 """Database service: Translates requests data into SQLA statements and execute."""
 from abc import ABCMeta
-from calendar import c
 from typing import Callable, List, Sequence, Any, Dict, overload, Literal, Type, Set
 
 from sqlalchemy import select, delete, or_, func
@@ -8,7 +7,7 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import (
-    load_only, selectinload, joinedload, ONETOMANY, MANYTOONE, make_transient, Relationship
+    load_only, selectinload, joinedload, ONETOMANY, MANYTOONE, Relationship
 )
 from sqlalchemy.sql import Delete, Select
 from sqlalchemy.sql.selectable import Alias
@@ -23,8 +22,8 @@ from biodm.managers import DatabaseManager
 from biodm.tables import ListGroup, Group
 from biodm.tables.asso import asso_list_group
 from biodm.utils.security import UserInfo, PermissionLookupTables
-from biodm.utils.sqla import CompositeInsert, UpsertStmt, UpsertStmtValuesHolder
-from biodm.utils.utils import unevalled_all, unevalled_or, to_it, partition, OrderedSet
+from biodm.utils.sqla import CompositeInsert, UpsertStmt, UpsertStmtValuesHolder, IS_SQLITE
+from biodm.utils.utils import unevalled_all, unevalled_or, to_it, partition
 
 
 SUPPORTED_NUM_OPERATORS = ("gt", "ge", "lt", "le", "min", "max")
@@ -334,7 +333,7 @@ class UnaryEntityService(DatabaseService):
     def __init__(self, app, table: Type[Base], *args, **kwargs) -> None:
         # Entity info.
         self.table = table
-        self.pk = OrderedSet(table.col(name) for name in table.pk)
+        self.pk = tuple(table.col(name) for name in table.pk)
         # Take a snapshot at declaration time, convenient to isolate runtime permissions.
         self._inst_relationships = self.table.dyn_relationships()
         # Enable service - table linkage
@@ -508,9 +507,9 @@ class UnaryEntityService(DatabaseService):
         """
         # SQLite support for composite primary keys, with leading id.
         if (
-            'sqlite' in str(config.DATABASE_URL) and
+            IS_SQLITE and
             hasattr(self.table, 'id') and
-            len(list(self.table.pk)) > 1
+            len(self.table.pk) > 1
         ):
             await self.populate_ids_sqlite(data)
 
@@ -603,6 +602,12 @@ class UnaryEntityService(DatabaseService):
                         rel_stmt.subquery(),
                         isouter=True
                     )
+                    # Eager load: spares a lazy load per row at serialization time.
+                    stmt = stmt.options(
+                        selectinload(
+                            getattr(self.table, n)
+                        )
+                    )
             else:
                 # TODO: check permissions ?
                 # Possible edge cases in o2o relationships ??
@@ -775,7 +780,7 @@ class UnaryEntityService(DatabaseService):
         # Prepare recursive call for nested filters, and do an (inner) left join -> Filtering.
         for nf_key, nf_conditions in nested_conditions.items():
             nf_svc = self._svc_from_rel_name(nf_key)
-            nf_fields = nf_svc.table.pk | set(nf_conditions.keys())
+            nf_fields = set(nf_svc.table.pk) | nf_conditions.keys()
             nf_conditions.update(propagate) # Take in special parameters.
             nf_stmt = (
                 await nf_svc.filter(nf_fields, nf_conditions, stmt_only=True, user_info=user_info)
@@ -966,8 +971,9 @@ class CompositeEntityService(UnaryEntityService):
             # Insert and populate back into item.
             if rel.uselist:
                 delay = await svc._insert_list(to_it(delay), **kwargs)
-                # Isolate objects that are not already present.
-                delay, updated = partition(delay, lambda e: e not in getattr(item, key))
+                # Isolate objects that are not already present, set for constant time lookups.
+                present = set(getattr(item, key))
+                delay, updated = partition(delay, lambda e: e not in present)
                 # Refresh objects that were present so item comes back with updated values.
                 for u in updated:
                     await session.refresh(u)
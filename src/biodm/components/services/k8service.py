@@ -2,6 +2,7 @@ from typing import Any, Callable, Sequence
 
 from sqlalchemy import Insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
 from biodm.components import Base, K8sManifest
 from biodm.managers import DatabaseManager, K8sManager
@@ -43,7 +44,9 @@ class K8Service(CompositeEntityService):
                 f = self.k8.create_service
             case _:
                 f = self.k8.create_custom_resource
-        f(manifest)
+        # Blocking kubernetes client: keep the event loop free while it submits and waits.
+        # Deployments hold a worker thread until available, at most config.SERVER_TIMEOUT.
+        await run_in_threadpool(f, manifest)
 
     @DatabaseManager.in_session
     async def _insert(
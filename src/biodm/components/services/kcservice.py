@@ -29,7 +29,9 @@ class KCService(CompositeEntityService):
         user_info: UserInfo
     ):
         """Sync Keycloak and input data."""
-        inter = remote.keys() & (set(c.name for c in self.table.__table__.columns) - self.table.pk)
+        inter = remote.keys() & (
+            set(c.name for c in self.table.__table__.columns).difference(self.table.pk)
+        )
         fill = {
             key: remote[key] for key in inter if key not in data.keys()
         }
@@ -158,9 +160,7 @@ class KCUserService(KCService):
         groups = [str(KCGroupService.kcpath(group)) for group in groups]
         if user:
             # TODO: manage groups ? Maybe useless.
-            group_ids = group_ids or []
-            for gid in group_ids:
-                await self.kc.group_user_add(user['id'], gid)
+            await self.kc.groups_user_add(user['id'], group_ids or [])
             await self.sync(user, data, user_info=user_info)
 
         elif not user_info.is_admin:
@@ -3,28 +3,32 @@
 - S3File entity
 - Versioned
 """
-from typing import TYPE_CHECKING, Any, Tuple, Type, Set, ClassVar, Type, Dict
+from typing import TYPE_CHECKING, Any, Tuple, Type, Set, ClassVar, Dict, FrozenSet
 from uuid import uuid4
 
 from sqlalchemy import (
-    BOOLEAN, Integer, inspect, Column, String, TIMESTAMP, ForeignKey, BigInteger
+    BOOLEAN, Integer, Column, String, TIMESTAMP, ForeignKey, BigInteger, Table, event
 )
 from sqlalchemy.ext.asyncio import AsyncAttrs
-from sqlalchemy.ext.declarative import declared_attr
 from sqlalchemy.orm import (
-    DeclarativeBase, relationship, Relationship, mapped_column, Mapped, declared_attr
+    DeclarativeBase, relationship, mapped_column, Mapped, declared_attr, configure_mappers
 )
 
-from biodm import config
-from biodm.utils.utils import utcnow, classproperty, OrderedSet
+from biodm.utils.sqla import IS_SQLITE
+from biodm.utils.utils import utcnow, classproperty
 
 
 if TYPE_CHECKING:
     from biodm.components.services import DatabaseService
     from biodm.components.controllers import ResourceController
-    from sqlalchemy.orm import Relationship
     from biodm.tables import Upload
 
+
+def _uuid4_str() -> str:
+    """Random salt generator, for S3File keys."""
+    return str(uuid4())
+
+
 class Base(DeclarativeBase, AsyncAttrs):
     """Base class for ORM declarative Tables.
  
@@ -35,13 +39,30 @@ class Base(DeclarativeBase, AsyncAttrs):
     """
     svc: ClassVar[Type['DatabaseService']]
     ctrl: ClassVar[Type['ResourceController']]
+    # Introspection lookups, populated once mapper is configured.
+    _autoincrement: ClassVar[FrozenSet[str]]
+    _has_default: ClassVar[FrozenSet[str]]
+    _colinfo: ClassVar[Dict[str, Tuple[Column, type]]]
+    _target_tables: ClassVar[Dict[str, Table]]
+    _has_submitter_username: ClassVar[bool]
+
+    @classmethod
+    def _lookup(cls, key: str) -> Any:
+        """Fetch an introspection lookup, configuring pending mappers on first access."""
+        try:
+            return cls.__dict__[key]
+        except KeyError:
+            configure_mappers()
+            return cls.__dict__[key]
 
-    def __init_subclass__(cls, **kw: Any) -> None:
-        """Populates permission dict."""
-        from biodm.utils.security import PermissionLookupTables
-        if hasattr(cls, "__permissions__"):
-            PermissionLookupTables.raw_permissions[cls.__name__] = (cls, cls.__permissions__)
-        return super().__init_subclass__(**kw)
+    @classmethod
+    def warm(cls) -> None:
+        """Configure all mappers in a single pass and prime memoized properties.
+        Call once every table is declared, dynamic permission ones included."""
+        configure_mappers()
+        for mapper in cls.registry.mappers:
+            for prop in ('pk', 'required', 'relationships', 'has_submitter_username'):
+                getattr(mapper.class_, prop)
 
     @declared_attr
     def __tablename__(cls):
@@ -50,8 +71,11 @@ class Base(DeclarativeBase, AsyncAttrs):
 
     @classmethod
     def dyn_relationships(cls):
-        """Return table relationships. dyn stands for dynamic -> use for setup."""
-        return inspect(cls).mapper.relationships
+        """Return table relationships. dyn stands for dynamic -> use for setup.
+
+        Reads mapper reference set by declarative, bypassing inspect() dispatch.
+        """
+        return cls.__mapper__.relationships
 
     @classproperty
     def relationships(cls):
@@ -60,52 +84,53 @@ class Base(DeclarativeBase, AsyncAttrs):
 
     @classmethod
     def target_table(cls, name):
-        """Return target table of a property."""
-        col = cls.col(name).property
-        return col.target if isinstance(col, Relationship) else None
+        """Return target table of a property. Memoized on hit, misses are not cached as
+        relationships may still be added by backrefs."""
+        target_tables = cls._lookup('_target_tables')
+        try:
+            return target_tables[name]
+        except KeyError:
+            rel = cls.__mapper__.relationships.get(name)
+            if rel is None:
+                return None
+            target_tables[name] = rel.target
+            return rel.target
 
     @classproperty
-    def pk(cls) -> OrderedSet[str]:
-        """Return primary key names."""
+    def pk(cls) -> Tuple[str, ...]:
+        """Return primary key names, as a tuple: ordered and safe to iterate multiple times."""
         pks = [c.name for c in cls.__table__.primary_key.columns]
         if cls.is_versioned: # ensure version is last.
             pks.remove('version')
             pks.append('version')
-        return OrderedSet(pks)
+        return tuple(pks)
 
     @classmethod
-    def col(cls, name: str):
-        """Return columns object from name."""
-        return cls.__dict__[name]
+    def col(cls, name: str) -> Column:
+        """Return mapped Column object from name, resolves inherited columns as well.
+
+        :param name: column key
+        :type name: str
+        :raises KeyError: name is not a column, e.g. a relationship
+        :return: Column, not the instrumented class attribute
+        :rtype: Column
+        """
+        return cls.__mapper__.columns[name]
 
     @classmethod
     def is_autoincrement(cls, name: str) -> bool:
-        """Flag if column is autoincrement.
-
-        Warning! This check is backend dependent and should be changed when supporting a new one.
-        E.g. Oracle backend will not react appropriately.
-        - https://groups.google.com/g/sqlalchemy/c/o5YQNH5UUko
-        """
-        # Enforced by DatabaseService.populate_ids_sqlite
-        if name == 'id' and 'sqlite' in str(config.DATABASE_URL):
-            return True
-
-        if cls.__table__.columns[name] is cls.__table__.autoincrement_column:
-            return True
-
-        return cls.col(name).autoincrement == True
+        """Flag if column is autoincrement."""
+        return name in cls._lookup('_autoincrement')
 
     @classmethod
     def has_default(cls, name: str) -> bool:
         """Flag if column has default value."""
-        col = cls.col(name)
-        return col.default or col.server_default
+        return name in cls._lookup('_has_default')
 
     @classmethod
     def colinfo(cls, name: str) -> Tuple[Column, type]:
         """Return column and associated python type for conditions."""
-        col = cls.col(name)
-        return col, col.type.python_type
+        return cls._lookup('_colinfo')[name]
 
     @classproperty
     def is_versioned(cls) -> bool:
@@ -134,16 +159,58 @@ class Base(DeclarativeBase, AsyncAttrs):
         :return: Flag
         :rtype: bool
         """
-        return (
-            'submitter_username' in cls.__dict__ and
-            cls.submitter_username.foreign_keys  and
-            len(cls.submitter_username.foreign_keys) == 1 and
-            next(
-                iter(
-                    cls.submitter_username.foreign_keys
-                )
-            ).target_fullname == 'USER.username'
-        )
+        return cls._lookup('_has_submitter_username')
+
+
+@event.listens_for(Base, "mapper_configured", propagate=True)
+def _on_mapper_configured(_, cls: Type[Base]) -> None:
+    """Single pass per table, after its mapper is configured:
+    - Registers declared permissions
+    - Computes column introspection lookups
+
+    Warning! autoincrement check is backend dependent and should be changed when supporting a new
+    one. E.g. Oracle backend will not react appropriately.
+    - https://groups.google.com/g/sqlalchemy/c/o5YQNH5UUko
+    """
+    # Defered import as it depends on this module.
+    from biodm.utils.security import PermissionLookupTables
+    if hasattr(cls, "__permissions__"):
+        PermissionLookupTables.raw_tables.append(cls)
+        PermissionLookupTables.raw_permissions.append(cls.__permissions__)
+
+    table = cls.__table__
+    autoincrement, has_default, colinfo = set(), set(), {}
+    for c in table.columns:
+        if (
+            # Enforced by DatabaseService.populate_ids_sqlite
+            (c.name == 'id' and IS_SQLITE) or
+            c is table.autoincrement_column or
+            c.autoincrement == True
+        ):
+            autoincrement.add(c.name)
+        if c.default or c.server_default:
+            has_default.add(c.name)
+
+    for prop in cls.__mapper__.column_attrs:
+        col = cls.col(prop.key)
+        try:
+            colinfo[prop.key] = col, col.type.python_type
+        except NotImplementedError: # Type without python equivalent, not usable in conditions.
+            continue
+
+    # Bypasses declarative hooks, see classproperty.
+    type.__setattr__(cls, '_autoincrement', frozenset(autoincrement))
+    type.__setattr__(cls, '_has_default', frozenset(has_default))
+    type.__setattr__(cls, '_colinfo', colinfo)
+    type.__setattr__(cls, '_target_tables', {})
+
+    submitter = cls.__mapper__.columns.get('submitter_username')
+    fks = submitter.foreign_keys if submitter is not None else ()
+    type.__setattr__(
+        cls,
+        '_has_submitter_username',
+        len(fks) == 1 and next(iter(fks)).target_fullname == 'USER.username'
+    )
 
 
 class S3File:
@@ -163,7 +230,7 @@ class S3File:
 
     dl_count = Column(Integer, nullable=False, server_default='0')
 
-    key_salt = Column(String, nullable=False, default=lambda: str(uuid4()))
+    key_salt = Column(String, nullable=False, default=_uuid4_str)
 
     emited_at = Column(
         TIMESTAMP(timezone=True), default=utcnow, nullable=False
@@ -1,10 +1,9 @@
+from os import path
+
 from starlette.config import Config
-from databases import DatabaseURL
 
-try:
-    config = Config('.env')
-except FileNotFoundError:
-    config = Config()
+# Environment is read once, at import: settings below are plain module constants.
+config = Config('.env') if path.isfile('.env') else Config()
 
 # TODO: [prio medium - before release]
 # Change credentials to Secret type
@@ -27,7 +26,13 @@ LIMIT           = config('LIMIT',           cast=int,  default=50)
 CACHE_MAX_AGE   = config('CACHE_MAX_AGE',   cast=int,  default=600)
 
 # DB.
-DATABASE_URL = config("DATABASE_URL", cast=str, default="sqlite:///:memory:")
+DATABASE_URL       = config("DATABASE_URL",       cast=str,  default="sqlite:///:memory:")
+DB_POOL_SIZE       = config("DB_POOL_SIZE",       cast=int,  default=20)
+DB_POOL_OVERFLOW   = config("DB_POOL_OVERFLOW",   cast=int,  default=30)
+DB_POOL_TIMEOUT    = config("DB_POOL_TIMEOUT",    cast=int,  default=30)
+DB_POOL_RECYCLE    = config("DB_POOL_RECYCLE",    cast=int,  default=1800)
+DB_QUERY_CACHE     = config("DB_QUERY_CACHE",     cast=int,  default=1200)
+DB_STATEMENT_CACHE = config("DB_STATEMENT_CACHE", cast=int,  default=2048)
 
 # S3 Bucket.
 S3_ENDPOINT_URL        = config('S3_ENDPOINT_URL',        cast=str,  default=None)
@@ -1,77 +1,63 @@
-import json
 from http import HTTPStatus
+from typing import Dict, Tuple
+
+import orjson
 
 from biodm.utils.utils import json_response
-from .exceptions import (
-    EndpointError,
-    FailedUpdate,
-    PayloadJSONDecodingError,
-    RequestError,
-    FailedDelete,
-    FailedRead,
-    InvalidCollectionMethod,
-    PayloadEmptyError,
-    UnauthorizedError,
-    TokenDecodingError,
-    UpdateVersionedError,
-    FileNotUploadedError,
-    FileTooLargeError,
-    DataError,
-    ReleaseVersionError
-)
+from .exceptions import RequestError
+
+
+# HTTP status -> reason phrase, spares an enum lookup per error.
+_PHRASES: Dict[int, str] = {int(s): s.phrase for s in HTTPStatus}
 
 
 class Error:
     """Error printing class."""
+    __slots__ = ('status', 'detail', 'reason', 'body')
+
     def __init__(self, status, detail=None) -> None:
         self.status = status
         self.detail = detail
-        self.reason = HTTPStatus(self.status).phrase
-
-    @property
-    def __dict__(self):
-        return {"code": self.status, "reason": self.reason, "message": self.detail}
+        self.reason = _PHRASES[self.status]
+        # Serialized once, at construction.
+        self.body = orjson.dumps({
+            "code": self.status,
+            "reason": self.reason,
+            "message": self.detail,
+        })
 
     @property
     def response(self):
-        return json_response(data=json.dumps(self.__dict__), status_code=self.status)
+        return json_response(data=self.body, status_code=self.status)
+
+
+_SERVER_ERROR = "Server Error. Contact an administrator about it."
+# Recurring errors with a fixed detail, serialized once. Responses are still built per call,
+# as they may be altered downstream.
+_PREBUILT: Dict[Tuple[int, str], Error] = {
+    (status, detail): Error(status, detail) for status, detail in (
+        (500, _SERVER_ERROR),
+        (204, "No input data."),
+        (511, "Authentication required."),
+    )
+}
 
 
 async def onerror(_, exc):
     """Error event handler.
 
+    Kept async although it awaits nothing: starlette dispatches sync handlers to a threadpool.
+
     Relevant documentation: https://restfulapi.net/http-status-codes/"""
     detail = None
 
-    if issubclass(exc.__class__, RequestError):
+    if isinstance(exc, RequestError):
          # TODO: investigate
-        detail = exc.detail + (
-            str(exc.messages) if hasattr(exc, 'messages') else ""
-        )
-
-        match exc:
-            case FileTooLargeError():
-                status = 400
-            case DataError() | EndpointError() | PayloadJSONDecodingError():
-                status = 400
-            case FailedDelete() | FailedRead() | FailedUpdate():
-                status = 404
-            case InvalidCollectionMethod():
-                status = 405
-            case (
-                UpdateVersionedError() |
-                FileNotUploadedError() |
-                ReleaseVersionError()
-            ):
-                status = 409
-            case PayloadEmptyError():
-                status = 204
-            case TokenDecodingError():
-                status = 503
-            case UnauthorizedError():
-                status = 511
+        msgs = getattr(exc, 'messages', None)
+        detail = f"{exc.detail}{msgs}" if msgs else exc.detail
+        status = exc.status
     else:
         status = 500
-        detail = "Server Error. Contact an administrator about it."
+        detail = _SERVER_ERROR
 
-    return Error(status, detail).response
+    return (_PREBUILT.get((status, detail)) or Error(status, detail)).response
@@ -1,4 +1,6 @@
 class RequestError(RuntimeError):
+    """Errors reported to the client, status is the HTTP status code sent back."""
+    status: int = 500
     detail: str
 
     def __init__(self, detail: str)  -> None:
@@ -32,13 +34,19 @@ class KeycloakUnavailableError(RuntimeError):
     """Raised when Keycloak failed to initialize."""
 
 
+class DeploymentTimeoutError(RuntimeError):
+    """Raised when a kubernetes deployment is not available in time."""
+
+
 ## Payload
 class PayloadEmptyError(RequestError):
     """Raised when a route expecting a payload, is reached without one."""
+    status = 204
 
 
 class PayloadJSONDecodingError(RequestError):
     """Raised when payload data failed to be parsed in JSON format."""
+    status = 400
 
 
 class SchemaError(ImplementionError):
@@ -47,35 +55,43 @@ class SchemaError(ImplementionError):
 
 class TokenDecodingError(RequestError):
     """Raised when token decoding failed."""
+    status = 503
 
 
 class UpdateVersionedError(RequestError):
     """Raised when an attempt at updating a versioned resource is detected."""
+    status = 409
 
 
 class ReleaseVersionError(RequestError):
     """Raised when releasing another version than the max is attempted."""
+    status = 409
 
 
 class FileNotUploadedError(RequestError):
     """Raised when trying to download a file that has not been uploaded yet."""
+    status = 409
 
 
 class FileTooLargeError(RequestError):
     """Raised when trying to create a too large file."""
+    status = 400
 
 
 class DataError(RequestError):
     """Raised when input data is incorrect."""
+    status = 400
 
 
 class EndpointError(RequestError):
     """Raised when an endpoint is reached with wrong attributes, parameters and so on."""
+    status = 400
 
 
 ## Routing
 class InvalidCollectionMethod(RequestError):
     """Raised when a unit method is accesed as a collection."""
+    status = 405
     def __init__(self, detail: str) -> None:
         super().__init__(detail=detail + "Method not allowed on a collection.")
 
@@ -86,6 +102,7 @@ class PartialIndex(RequestError):
 
 class UnauthorizedError(RequestError):
     """Raised when a request on a group restricted route is sent by an unauthorized user."""
+    status = 511
     def __init__(self, detail: str="Authentication required.") -> None:
         super().__init__(detail)
 
@@ -101,14 +118,17 @@ class FailedCreate(RequestError):
 
 class FailedRead(RequestError):
     """Requested record doesn't exist."""
+    status = 404
 
 
 class FailedUpdate(RequestError):
     """Raised when an update operation is not successful."""
+    status = 404
 
 
 class FailedDelete(RequestError):
     """Raised when a delete operation is not successful."""
+    status = 404
 
 
 class AsyncDBError(DBError):
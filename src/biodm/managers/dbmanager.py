@@ -1,5 +1,6 @@
 from __future__ import annotations
-from contextlib import asynccontextmanager, AsyncExitStack
+import asyncio
+from contextlib import asynccontextmanager, nullcontext
 from typing import AsyncGenerator, TYPE_CHECKING, Callable, Any
 
 from databases import DatabaseURL
@@ -10,24 +11,49 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sess
 from biodm import Scope, config
 from biodm.component import ApiManager
 from biodm.exceptions import PostgresUnavailableError, DBError
+from biodm.utils.sqla import IS_SQLITE
 
 if TYPE_CHECKING:
     from biodm.api import Api
     from biodm.component import ApiComponent
 
 
+# Backend -> async driver scheme.
+_ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+
+def _serialize(_, data: Any, serializer: Callable) -> Any:
+    """run_sync target: applies serializer, defined once rather than per call."""
+    return serializer(data)
+
+
 class DatabaseManager(ApiManager):
     """Manages DB side query execution."""
     def __init__(self, app: Api) -> None:
         super().__init__(app=app)
         self._database_url: DatabaseURL = self.async_database_url(config.DATABASE_URL)
+        # SQLite keeps SQLAlchemy defaults: in memory databases live in a single connection.
+        engine_kwargs = {} if IS_SQLITE else {
+            'pool_size': config.DB_POOL_SIZE,
+            'max_overflow': config.DB_POOL_OVERFLOW,
+            'pool_timeout': config.DB_POOL_TIMEOUT,
+            'pool_recycle': config.DB_POOL_RECYCLE,
+            'pool_pre_ping': True,
+            # asyncpg side statement caches.
+            'connect_args': {
+                'statement_cache_size': config.DB_STATEMENT_CACHE,
+                'prepared_statement_cache_size': config.DB_STATEMENT_CACHE,
+            },
+        }
         try:
             self.engine = create_async_engine(
                 str(self._database_url),
                 echo=Scope.DEBUG in app.scope,
+                query_cache_size=config.DB_QUERY_CACHE,
+                **engine_kwargs,
             )
 
-            if "sqlite" in str(self._database_url):
+            if IS_SQLITE:
                 event.listens_for(self.engine.sync_engine, "connect")(self.sqlite_declare_strrev)
 
             self.async_session = async_sessionmaker(
@@ -36,43 +62,49 @@ class DatabaseManager(ApiManager):
                 expire_on_commit=False,
             )
         except SQLAlchemyError as e:
-            raise PostgresUnavailableError(f"Failed to connect to DB") from e
+            raise PostgresUnavailableError("Failed to connect to DB") from e
 
     @property
     def endpoint(self):
         return f"{self.engine.url.host}:{self.engine.url.port}"
 
     @staticmethod
-    def async_database_url(url: DatabaseURL) -> str:
+    def async_database_url(url: DatabaseURL | str) -> DatabaseURL:
         """Adds a matching async driver to a database url."""
-        url = str(url)
-        match url.split("://"):
-            case ["postgresql", _]:
-                url = url.replace( # type: ignore [unreachable]
-                    "postgresql://", "postgresql+asyncpg://"
-                )
-            case ["sqlite", _]:
-                url = url.replace( # type: ignore [unreachable]
-                    "sqlite://", "sqlite+aiosqlite://"
-                )
-            case _:
-                raise DBError(
-                    "Only ['postgresql', 'sqlite'] backends are supported at the moment."
-                )
-        return DatabaseURL(url)
+        scheme, _, rest = str(url).partition("://")
+        try:
+            return DatabaseURL(f"{_ASYNC_DRIVERS[scheme]}://{rest}")
+        except KeyError:
+            raise DBError(
+                f"Only {list(_ASYNC_DRIVERS)} backends are supported at the moment."
+            ) from None
 
     @asynccontextmanager
     async def session(self) -> AsyncGenerator[AsyncSession, None]:
         """Opens and yields a new AsyncSession."""
-        try:
-            async with self.async_session() as session:
+        async with self.async_session() as session:
+            try:
                 yield session
                 await session.commit()
-        except Exception as e:
-            await session.rollback()
-            raise e
-        finally:
-            await session.close()
+            except Exception as e:
+                await session.rollback()
+                raise e
+
+    async def warm_pool(self) -> None:
+        """Open pool connections ahead of first requests, as many as the pool keeps."""
+        if IS_SQLITE:
+            return
+        conns = await asyncio.gather(
+            *(self.engine.connect() for _ in range(config.DB_POOL_SIZE)),
+            return_exceptions=True
+        )
+        # Give back every opened connection, even when some failed.
+        await asyncio.gather(
+            *(conn.close() for conn in conns if not isinstance(conn, BaseException))
+        )
+        errors = [conn for conn in conns if isinstance(conn, BaseException)]
+        if errors:
+            raise PostgresUnavailableError("Failed to connect to DB") from errors[0]
 
     async def init_db(self) -> None:
         """Drop all tables and create them."""
@@ -98,26 +130,23 @@ class DatabaseManager(ApiManager):
         - All functions applying this decorator should pass down some `**kwargs`
 
         """
-        async def wrapper(*args, **kwargs) -> Any | str | None:
+        async def wrapper(
+            *args,
+            session: AsyncSession | None = None,
+            serializer: Callable | None = None,
+            **kwargs
+        ) -> Any | str | None:
             """ Produce and passes down a session if needed.
                 Finally after the function returns, serialization is applied if needed.
             """
-            serializer = kwargs.pop('serializer', None)
-
-            # conditional context management.
-            async with AsyncExitStack() as stack:
-                # In priciple decorated function is a class member.
-                self: ApiComponent = args[0]
-                session = kwargs.pop('session', None)
-                # Ensure session.
-                session = (
-                    session if session
-                    else await stack.enter_async_context(self.app.db.session())
-                )
+            # In priciple decorated function is a class member.
+            self: ApiComponent = args[0]
+            # Ensure session: nested calls reuse the one passed down.
+            async with (nullcontext(session) if session else self.app.db.session()) as session:
                 # Call and serialize result if requested.
                 db_result = await db_exec(*args, session=session, **kwargs)
                 result = await session.run_sync(
-                    lambda _, data: serializer(data), db_result
+                    _serialize, db_result, serializer
                 ) if serializer else db_result
             return result
 
@@ -1,11 +1,21 @@
 import time
-from typing import Tuple, List, Any, Dict
+from functools import cached_property, lru_cache
+from typing import Callable, Tuple, List, Any, Dict
 
-from kubernetes import client
+from kubernetes import client, watch
+from biodm import config
 from biodm.component import ApiManager
+from biodm.exceptions import DeploymentTimeoutError
 from biodm.scope import Scope
 
 
+@lru_cache(maxsize=256)
+def _custom_resource_params(api_version: str, kind: str) -> Tuple[str, str, str]:
+    """Group, version and plural of a custom resource, memoized as manifests recur."""
+    group, version = api_version.split('/')
+    return group, version, kind.lower() + 's'
+
+
 class K8sManager(ApiManager):
     """Small util wrapper around kubernetes python client API.
 
@@ -19,12 +29,6 @@ class K8sManager(ApiManager):
     - https://github.com/kubernetes-client/python/blob/a6d44ff625b5e8d8ad380a70245d40fa3d5472b2/kubernetes/README.md?plain=1
     Each api has access to a subset of the ressources.
     """
-    # APIs
-    _AppsV1Api: client.AppsV1Api = None
-    _CoreV1Api: client.CoreV1Api = None
-    _NetworkingV1Api: client.NetworkingApi = None
-    _CustomObjectsApi: client.CustomObjectsApi = None
-
     def __init__(
         self,
         app,
@@ -62,33 +66,25 @@ class K8sManager(ApiManager):
         """Change active namespace"""
         self.namespace = namespace
 
-    @property
+    @cached_property
     def AppsV1Api(self) -> client.AppsV1Api:
         """AppsV1 kubernetes api"""
-        if not self._AppsV1Api:
-            self._AppsV1Api = client.AppsV1Api(self._client)
-        return self._AppsV1Api
+        return client.AppsV1Api(self._client)
 
-    @property
+    @cached_property
     def CoreV1Api(self) -> client.CoreV1Api:
         """CoreV1 kubernetes api"""
-        if not self._CoreV1Api:
-            self._CoreV1Api = client.CoreV1Api(self._client)
-        return self._CoreV1Api
+        return client.CoreV1Api(self._client)
 
-    @property
+    @cached_property
     def NetworkingV1Api(self) -> client.NetworkingV1Api:
         """NetworkingV1 kubernetes api"""
-        if not self._NetworkingV1Api:
-            self._NetworkingV1Api = client.NetworkingV1Api(self._client)
-        return self._NetworkingV1Api
+        return client.NetworkingV1Api(self._client)
 
-    @property
+    @cached_property
     def CustomObjectsApi(self) -> client.CustomObjectsApi:
-        """NetworkingV1 kubernetes api"""
-        if not self._CustomObjectsApi:
-            self._CustomObjectsApi = client.CustomObjectsApi(self._client)
-        return self._CustomObjectsApi
+        """CustomObjects kubernetes api"""
+        return client.CustomObjectsApi(self._client)
 
     def read_deployment(self, name: str, **kwargs) -> list:
         return self.AppsV1Api.read_namespaced_deployment(
@@ -110,11 +106,7 @@ class K8sManager(ApiManager):
     def list_services_ports(self, **kwargs) -> list:
         """List all service ports in use, support selectors."""
         resp = self.CoreV1Api.list_service_for_all_namespaces(watch=False, **kwargs)
-        ret = []
-        for srv in resp.items:
-            for port in srv.spec.ports:
-                ret.append(port.port)
-        return ret
+        return [port.port for srv in resp.items for port in srv.spec.ports]
 
     @staticmethod
     def get_name_in_manifest(manifest: Dict[str, str]) -> str:
@@ -125,35 +117,47 @@ class K8sManager(ApiManager):
             return metadata.get("name", None)
         raise Exception(f"field metadata.name required in {kind} manifest")
 
-    def create_deployment(self, manifest: Dict[str, str]) -> None:
-        """Create a deployment"""
-        resp = None
+    def create_deployment(self, manifest: Dict[str, str], timeout: int | None = None) -> None:
+        """Create a deployment and wait for its replicas to be available.
+
+        Blocking: when called through a threadpool, a worker is held for the whole wait.
+
+        :param manifest: deployment manifest
+        :type manifest: Dict[str, str]
+        :param timeout: maximum waiting time in seconds, defaults to config.SERVER_TIMEOUT
+        :type timeout: int, optional
+        :raises DeploymentTimeoutError: replicas not available within timeout
+        """
         name = self.get_name_in_manifest(manifest)
         specs = manifest.get("spec", {})
         nreplicas = specs.get("replicas", 1)
 
-        resp = self.AppsV1Api.create_namespaced_deployment(
+        self.AppsV1Api.create_namespaced_deployment(
             body=manifest,
             namespace=self.namespace
         )
 
-        # Waiting for the instance to be up
-        while True:
-            resp = self.AppsV1Api.read_namespaced_deployment(
-                name=name,
-                namespace=self.namespace
-            )
-            if resp.status.available_replicas != nreplicas:
+        # Waiting for the instance to be up, on deployment events rather than polling.
+        w = watch.Watch()
+        for event in w.stream(
+            self.AppsV1Api.list_namespaced_deployment,
+            namespace=self.namespace,
+            field_selector=f"metadata.name={name}",
+            timeout_seconds=timeout or config.SERVER_TIMEOUT,
+        ):
+            if (event['object'].status.available_replicas or 0) >= nreplicas:
+                w.stop()
                 break
-            time.sleep(1)
+        else:
+            raise DeploymentTimeoutError(
+                f"Deployment {name}: {nreplicas} replica(s) not available in time."
+            )
 
         self.log(f"Deployment {name} up.")
 
     @staticmethod
     def get_custom_resource_params(manifest: Dict[str, str]) -> Tuple[str, str, str]:
-        group, version = manifest['apiVersion'].split('/')
-        plural = str(manifest['kind']).lower() + 's'
-        return group, version, plural
+        return _custom_resource_params(manifest['apiVersion'], str(manifest['kind']))
 
     def create_custom_resource(self, manifest: Dict[str, str]) -> None:
         """Create a custom resource."""
@@ -203,14 +207,42 @@ class K8sManager(ApiManager):
             namespace=self.namespace,
             name=name)
 
-    def create_service(self, manifest: Dict[str, str]):
-        """Create a service"""
+    @staticmethod
+    def wait_for(check: Callable[[], bool], timeout: float = 30.) -> bool:
+        """Poll check with an exponential backoff: 10ms, 20ms, 40ms... capped at 1s.
+
+        :param check: readiness predicate
+        :type check: Callable[[], bool]
+        :param timeout: maximum waiting time in seconds, defaults to 30
+        :type timeout: float, optional
+        :return: whether check passed before timeout
+        :rtype: bool
+        """
+        delay, waited = .01, 0.
+        while not check():
+            if waited >= timeout:
+                return False
+            time.sleep(delay)
+            waited += delay
+            delay = min(delay * 2, 1.)
+        return True
+
+    def create_service(self, manifest: Dict[str, str], wait: bool = False):
+        """Create a service, optionally wait for its cluster ip to be assigned.
+
+        :raises DeploymentTimeoutError: cluster ip not assigned in time
+        """
         name = self.get_name_in_manifest(manifest)
         resp = self.CoreV1Api.create_namespaced_service(
             body=manifest,
             namespace=self.namespace
         )
-        time.sleep(1)
+        if wait and not self.wait_for(lambda: bool(
+            self.CoreV1Api.read_namespaced_service_status(
+                name=name, namespace=self.namespace
+            ).spec.cluster_ip
+        )):
+            raise DeploymentTimeoutError(f"Service {name}: cluster ip not assigned in time.")
         self.log(f"Service {name} up - msg: {resp}.")
 
     def read_service_status(self, name: str):
@@ -220,12 +252,20 @@ class K8sManager(ApiManager):
         )
         self.log(resp)
 
-    def create_ingress(self, manifest: Dict[str, str]):
-        """Create an ingress"""
+    def create_ingress(self, manifest: Dict[str, str], wait: bool = False):
+        """Create an ingress, optionally wait for its load balancer address.
+
+        :raises DeploymentTimeoutError: load balancer address not assigned in time
+        """
         name = self.get_name_in_manifest(manifest)
-        resp = self.NetworkingV1Api.create_namespaced_ingress(
+        self.NetworkingV1Api.create_namespaced_ingress(
             body=manifest,
             namespace=self.namespace
         )
-        time.sleep(1)
+        if wait and not self.wait_for(lambda: bool(
+            self.read_ingress(name).status.load_balancer.ingress
+        )):
+            raise DeploymentTimeoutError(
+                f"Ingress {name}: load balancer address not assigned in time."
+            )
         self.log(f"Ingress {name} setup.")
@@ -1,10 +1,22 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING, List, Dict, Any
+import asyncio
+import re
+from copy import deepcopy
+from functools import cached_property
+from hashlib import sha256
+from threading import Lock
+from time import time
+from typing import TYPE_CHECKING, Awaitable, Callable, List, Dict, Any, Tuple
 
+from jwcrypto import jwk, jwt
+from jwcrypto.common import JWException
 from keycloak.keycloak_admin import KeycloakAdmin
 from keycloak.openid_connection import KeycloakOpenIDConnection
 from keycloak.keycloak_openid import KeycloakOpenID
 from keycloak.exceptions import KeycloakError, KeycloakDeleteError, KeycloakGetError
+from requests import Session
+from requests.adapters import HTTPAdapter
+from starlette.concurrency import run_in_threadpool
 
 from biodm.component import ApiManager
 from biodm.exceptions import (
@@ -14,6 +26,57 @@ from biodm.exceptions import (
 if TYPE_CHECKING:
     from biodm.api import Api
 
+# Keycloak entity ids.
+UUID_RE = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$")
+# Fields forwarded to Keycloak.
+USER_FIELDS = ("username", "email", "firstName", "lastName")
+GROUP_FIELDS = ("name", "name_parent")
+# Keycloak HTTP connections kept alive.
+HTTP_POOL_SIZE = 40
+# Decoded tokens kept by KeycloakManager: maximum entries, lifetime cap in seconds.
+TOKEN_CACHE_SIZE = 32768
+TOKEN_CACHE_TTL = 300
+# Users and groups lookups: maximum entries, lifetime of hits and misses in seconds.
+# Cache is per process: writes made through another worker show up after LOOKUP_TTL.
+LOOKUP_CACHE_SIZE = 16384
+LOOKUP_TTL = 60
+LOOKUP_MISS_TTL = 5
+
+
+def _session(connection: Any) -> Session | None:
+    """HTTP session of a python-keycloak connection, None if not found.
+
+    Relies on ConnectionManager._s, a private attribute as of python-keycloak 3.9.1 (pinned).
+    """
+    session = getattr(connection, '_s', None)
+    return session if isinstance(session, Session) else None
+
+
+def _resize_pool(session: Session) -> None:
+    """Remount session adapters with HTTP_POOL_SIZE connections, keeping their retry policy.
+
+    python-keycloak offers no option for it. Sessions are then shared across threadpool
+    workers: urllib3 pools are thread safe, python-keycloak passes headers per request and
+    the cookie jar is locked, so no session state is mutated concurrently.
+    """
+    for prefix, adapter in list(session.adapters.items()):
+        session.mount(
+            prefix, HTTPAdapter(pool_maxsize=HTTP_POOL_SIZE, max_retries=adapter.max_retries)
+        )
+        adapter.close()
+
+
+class _OpenIDConnection(KeycloakOpenIDConnection):
+    """Service account connection, refreshing its token one thread at a time.
+    Admin calls run concurrently in a threadpool, while sharing this connection."""
+    def __init__(self, *args, **kwargs) -> None:
+        self._refresh_lock = Lock()
+        super().__init__(*args, **kwargs)
+
+    def _refresh_if_required(self):
+        with self._refresh_lock:
+            super()._refresh_if_required()
+
 
 class KeycloakManager(ApiManager):
     """Manages a service account connection and an admin connection.
@@ -38,8 +101,11 @@ class KeycloakManager(ApiManager):
 
         self.jwt_options = jwt_options
         self.public_key = public_key
+        self._token_cache: Dict[bytes, Tuple[float, Dict[str, Any]]] = {}
+        self._lookup_cache: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
         try:
-            self._connexion = KeycloakOpenIDConnection(
+            self._connexion = _OpenIDConnection(
                 server_url=host,
                 user_realm_name="master",
                 realm_name=realm,
@@ -58,9 +124,36 @@ class KeycloakManager(ApiManager):
                 f"Failed to initialize connection to Keycloak: {e.error_message}"
             ) from e
 
-    @property
+        # Calls run in a threadpool: size each client's connection pool accordingly.
+        # Pools are left as is if python-keycloak no longer exposes its session.
+        for connection in (self._connexion, self._openid.connection):
+            session = _session(connection)
+            if session is not None:
+                _resize_pool(session)
+
+        # Token decoding material, parsed once. Unlike KeycloakOpenID.decode_token, honor
+        # verify_exp: jwcrypto skips exp when other claims are checked.
+        try:
+            self._jwk = jwk.JWK.from_pem(
+                f"-----BEGIN PUBLIC KEY-----\n {public_key} \n-----END PUBLIC KEY-----".encode()
+            )
+        except ValueError as e:
+            raise KeycloakUnavailableError("Invalid Keycloak public key") from e
+        self._verify_exp = jwt_options.get('verify_exp') is True
+        self._check_claims: Dict[str, Any] = {'exp': None} if self._verify_exp else {}
+        if jwt_options.get('verify_aud') is True:
+            self._check_claims['aud'] = client_id
+
+    def close(self) -> None:
+        """Release pooled HTTP connections of both clients."""
+        for connection in (self._connexion, self._openid.connection):
+            session = _session(connection)
+            if session is not None:
+                session.close()
+
+    @cached_property
     def admin(self):
-        """Admin connection."""
+        """Admin connection, built once: python-keycloak refreshes its token as needed."""
         return KeycloakAdmin(connection=self._connexion)
 
     @property
@@ -78,27 +171,44 @@ class KeycloakManager(ApiManager):
 
     async def redeem_code_for_token(self, code: str, redirect_uri: str):
         """Code for token."""
-        return self.openid.token(
+        return await run_in_threadpool(
+            self.openid.token,
             grant_type="authorization_code", code=code, redirect_uri=redirect_uri
         )
 
     async def decode_token(self, token: str):
-        """Decode token."""
-        def enclose_idrsa(idrsa) -> str:
-            return f"-----BEGIN PUBLIC KEY-----\n {idrsa} \n-----END PUBLIC KEY-----"
+        """Decode token.
+
+        Verified claims are cached by token digest for at most TOKEN_CACHE_TTL seconds, and not
+        past their expiry when it is checked, sparing a signature verification on each request
+        of a session.
+        """
+        digest = sha256(token.encode()).digest()
+        entry = self._token_cache.pop(digest, None)
+        if entry is not None and entry[0] > time():
+            self._token_cache[digest] = entry
+            return entry[1]
+
         try:
-            return self.openid.decode_token(
-                token, key=enclose_idrsa(self.public_key), options=self.jwt_options
+            claims = jwt.json_decode(
+                jwt.JWT(
+                    jwt=token, key=self._jwk, algs=["RS256"], check_claims=self._check_claims
+                ).claims
             )
-        except Exception as e:
-            raise TokenDecodingError("Invalid Token")
+        except (JWException, ValueError) as e: # ValueError: malformed token or claims.
+            raise TokenDecodingError("Invalid Token") from e
+
+        expiry = time() + TOKEN_CACHE_TTL
+        if self._verify_exp:
+            expiry = min(expiry, claims['exp'])
+        if len(self._token_cache) >= TOKEN_CACHE_SIZE: # Evict least recently used.
+            del self._token_cache[next(iter(self._token_cache))]
+        self._token_cache[digest] = expiry, claims
+        return claims
 
     def _user_data_to_payload(self, data: Dict[str, Any]):
-        payload = {
-            field: data.get(field, "")
-            for field in ("username", "email", "firstName", "lastName")
-        }
-        if "password" in data.keys():
+        payload = {field: data.get(field, "") for field in USER_FIELDS}
+        if "password" in data:
             payload["credentials"] = [
                 {
                     "type": "password",
@@ -109,10 +219,60 @@ class KeycloakManager(ApiManager):
         return payload
 
     def _group_data_to_payload(self, data: Dict[str, Any]):
-        return {
-            field: data.get(field, "")
-            for field in ("name", "name_parent")
-        }
+        return {field: data.get(field, "") for field in GROUP_FIELDS}
+
+    async def _cached_lookup(
+        self, kind: str, key: str, fetch: Callable[[str], Awaitable[Any]]
+    ) -> Any:
+        """Short lived memoization of users and groups lookups.
+
+        :param kind: lookup kind, used for invalidation
+        :type kind: str
+        :param key: lookup argument
+        :type key: str
+        :param fetch: lookup coroutine function, called on miss
+        :type fetch: Callable[[str], Awaitable[Any]]
+        :return: lookup result, a copy that callers may modify
+        :rtype: Any
+        """
+        k = (kind, key)
+        entry = self._lookup_cache.get(k)
+        if entry is not None and entry[0] > time():
+            return deepcopy(entry[1])
+
+        # Single flight: concurrent misses on the same key await one request.
+        flight = self._inflight.get(k)
+        if flight is None:
+            flight = asyncio.ensure_future(self._fetch_and_store(k, fetch))
+            self._inflight[k] = flight
+
+            def land(f: asyncio.Future) -> None:
+                if self._inflight.get(k) is f:
+                    del self._inflight[k]
+            flight.add_done_callback(land)
+        # Shielded: a cancelled caller does not cancel the others.
+        return deepcopy(await asyncio.shield(flight))
+
+    async def _fetch_and_store(
+        self, k: Tuple[str, str], fetch: Callable[[str], Awaitable[Any]]
+    ) -> Any:
+        """Run a lookup and cache its result, unless invalidated meanwhile."""
+        value = await fetch(k[1])
+        if self._inflight.get(k) is not asyncio.current_task():
+            return value
+        if len(self._lookup_cache) >= LOOKUP_CACHE_SIZE:
+            del self._lookup_cache[next(iter(self._lookup_cache))]
+        self._lookup_cache.pop(k, None)
+        self._lookup_cache[k] = (
+            time() + (LOOKUP_TTL if value is not None else LOOKUP_MISS_TTL), value
+        )
+        return value
+
+    def _invalidate(self, *kinds: str) -> None:
+        """Drop cached and in flight lookups of given kinds, after a write on Keycloak."""
+        for cache in (self._lookup_cache, self._inflight):
+            for k in [k for k in cache if k[0] in kinds]:
+                del cache[k]
 
     async def create_user(self, data: Dict[str, Any], groups: List[str] | None = None) -> str:
         groups = groups or []
@@ -124,37 +284,44 @@ class KeycloakManager(ApiManager):
             "emailVerified": False,
         })
         try:
-            return self.admin.create_user(payload, exist_ok=True)
+            return await run_in_threadpool(self.admin.create_user, payload, exist_ok=True)
         except KeycloakError as e:
             raise FailedCreate(
-                "Could not create Keycloak Group with data: "
-                f"{payload} -- msg: {e.error_message}"
+                "Could not create Keycloak "
+                f"User(username={payload['username']}) -- msg: {e.error_message}"
             ) from e
+        finally:
+            self._invalidate('user')
 
     async def update_user(self, user_id: str, data: Dict[str, Any]):
         """Update user."""
         try:
-            return self.admin.update_user(user_id=user_id, payload=data)
+            return await run_in_threadpool(self.admin.update_user, user_id=user_id, payload=data)
         except KeycloakError as e:
             raise FailedUpdate(
                 "Could not update Keycloak "
-                f"User(id={user_id}) with data: {data} -- msg: {e.error_message}."
+                f"User(id={user_id}) fields: {list(data)} -- msg: {e.error_message}."
             ) from e
+        finally:
+            self._invalidate('user')
 
     async def delete_user(self, user_id: str) -> None:
         """Delete user with this id."""
         try:
-            self.admin.delete_user(user_id)
+            await run_in_threadpool(self.admin.delete_user, user_id)
         except KeycloakDeleteError as e:
             raise FailedDelete(
                 "Could not delete Keycloak "
                 f"User(id={user_id}): {e.error_message}."
             ) from e
+        finally:
+            self._invalidate('user')
 
     async def create_group(self, name: str, parent: str | None = None) -> str:
         """Create group."""
         try:
-            return self.admin.create_group(
+            return await run_in_threadpool(
+                self.admin.create_group,
                 {"name": name},
                 parent=parent
             )
@@ -163,48 +330,77 @@ class KeycloakManager(ApiManager):
                 "Could not create Keycloak Group with data: "
                 f"name={name}, parent={parent} -- msg: {e.error_message}"
             ) from e
+        finally:
+            self._invalidate('group', 'group_name', 'group_path')
 
     async def update_group(self, group_id: str, data: Dict[str, Any]):
         """Update group."""
         try:
-            return self.admin.update_group(group_id=group_id, payload=data)
+            return await run_in_threadpool(
+                self.admin.update_group, group_id=group_id, payload=data
+            )
         except KeycloakError as e:
             raise FailedUpdate(
                 "Could not update Keycloak "
-                f"Group(id={group_id}) with data: {data} -- msg: {e.error_message}."
+                f"Group(id={group_id}) fields: {list(data)} -- msg: {e.error_message}."
             ) from e
+        finally:
+            self._invalidate('group', 'group_name', 'group_path')
 
     async def delete_group(self, user_id: str):
         """Delete group with this id."""
         try:
-            return self.admin.delete_group(user_id)
+            return await run_in_threadpool(self.admin.delete_group, user_id)
         except KeycloakDeleteError as e:
             raise FailedDelete(
                 "Could not delete Keycloak "
                 f"Group(id={user_id}): {e.error_message}."
             ) from e
+        finally:
+            self._invalidate('group', 'group_name', 'group_path')
 
     async def group_user_add(self, user_id: str, group_id: str):
         """Add user with user_id to group with group_id."""
         try:
-            return self.admin.group_user_add(user_id, group_id)
+            return await run_in_threadpool(self.admin.group_user_add, user_id, group_id)
         except KeycloakError as e:
             raise FailedCreate(
                 "Keycloak failed adding "
                 f"User(id={user_id}) to Group(id={group_id}): {e.error_message}"
             ) from e
 
+    async def groups_user_add(self, user_id: str, group_ids: List[str]):
+        """Add user with user_id to groups with group_ids, requests are sent concurrently."""
+        return await asyncio.gather(*(self.group_user_add(user_id, gid) for gid in group_ids))
+
     async def get_user_groups(self, user_id: str):
-        return self.admin.get_user_groups(user_id)
+        return await run_in_threadpool(self.admin.get_user_groups, user_id)
 
     async def get_group(self, id: str):
-        return self.admin.get_group(id)
+        return await self._cached_lookup('group', id, self._get_group)
+
+    async def _get_group(self, id: str):
+        return await run_in_threadpool(self.admin.get_group, id)
 
     async def get_group_by_name(self, name: str):
+        if UUID_RE.match(name): # Likely an id: single direct lookup.
+            try:
+                return await self.get_group(name)
+            except KeycloakGetError: # Group names may look like ids.
+                pass
+        return await self._cached_lookup('group_name', name, self._get_group_by_name)
+
+    async def _get_group_by_name(self, name: str):
         try:
             # query = {"name": name, "exact": True}
-            query = {"name": f'^{name}$', "exact": "true"}
-            groups = self.admin.get_groups(query=query)
+            query = {
+                "name": f'^{name}$',
+                "exact": "true",
+                # Attributes in the same response, skip subgroup trees.
+                "briefRepresentation": "false",
+                "populateHierarchy": "false",
+            }
+            groups = await run_in_threadpool(self.admin.get_groups, query=query)
             if len(groups) == 1:
                 return groups[0]
             return None
@@ -212,13 +408,19 @@ class KeycloakManager(ApiManager):
             return None
 
     async def get_group_by_path(self, path: str):
+        return await self._cached_lookup('group_path', path, self._get_group_by_path)
+
+    async def _get_group_by_path(self, path: str):
         try:
-            return self.admin.get_group_by_path(path)
+            return await run_in_threadpool(self.admin.get_group_by_path, path)
         except KeycloakGetError:
             return None
 
     async def get_user_by_username(self, username: str):
-        users = self.admin.get_users({"username": username})
+        return await self._cached_lookup('user', username, self._get_user_by_username)
+
+    async def _get_user_by_username(self, username: str):
+        users = await run_in_threadpool(self.admin.get_users, {"username": username})
         if len(users) > 0:
             return users[0]
         return None
@@ -6,7 +6,7 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship, aliased, foreign
 from sqlalchemy.ext.hybrid import hybrid_property
 
 from biodm.components import Base
-from biodm import config
+from biodm.utils.sqla import IS_POSTGRES, IS_SQLITE
 from .asso import asso_user_group
 
 
@@ -41,7 +41,7 @@ class Group(Base):
     @classmethod
     def _parent_path(cls) -> SQLColumnExpression[str]:
         sep = literal('__')
-        if "postgresql" in str(config.DATABASE_URL):
+        if IS_POSTGRES:
             return func.substring(
                 cls.path,
                 0,
@@ -52,7 +52,7 @@ class Group(Base):
                     )
                 )
             )
-        if "sqlite" in str(config.DATABASE_URL):
+        if IS_SQLITE:
             #  sqlite doesn't have reverse
             #            -> strrev declared in dbmanager
             #  postgres.position -> sqlite.instr
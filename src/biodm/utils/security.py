@@ -1,17 +1,18 @@
 """Security convenience functions."""
-from copy import deepcopy
+from collections import defaultdict
 from dataclasses import dataclass
 from dataclasses import field as dc_field
 from functools import wraps
 from inspect import getmembers, ismethod
-from typing import TYPE_CHECKING, List, Tuple, Set, ClassVar, Type, Any, Dict
+from sys import intern
+from typing import TYPE_CHECKING, List, Tuple, ClassVar, Type, Any, Dict, DefaultDict
 
 from marshmallow import fields, Schema
 from starlette.requests import HTTPConnection
 from starlette.types import ASGIApp, Receive, Scope, Send
 from sqlalchemy import ForeignKeyConstraint, Column, ForeignKey
 from sqlalchemy.orm import (
-    relationship, Relationship, backref, ONETOMANY, mapped_column, MappedColumn
+    relationship, Relationship, backref, ONETOMANY, mapped_column, MappedColumn, configure_mappers
 )
 
 from biodm.exceptions import UnauthorizedError, ImplementionError
@@ -156,7 +157,7 @@ def admin_required(f):
     return group_required(f, groups=["admin"])
 
 
-@dataclass
+@dataclass(slots=True)
 class Permission:
     """Holds dynamic permissions for a given entity's attributes."""
     field: Relationship | str
@@ -168,25 +169,51 @@ class Permission:
     propagates_to: List[str] = dc_field(default_factory=lambda: [])
 
     @classproperty
-    def verbs(cls) -> Set[str]:
-        """verb fields."""
-        return set(cls.__dataclass_fields__.keys() - set(('field', 'propagates_to')))
+    def verbs(cls) -> Tuple[str, ...]:
+        """verb fields, in declaration order."""
+        return tuple(
+            key for key in cls.__dataclass_fields__.keys()
+            if key not in ('field', 'propagates_to')
+        )
+
+    @property
+    def any_enabled(self) -> bool:
+        """True if at least one verb is enabled, short-circuits."""
+        return any(getattr(self, verb) for verb in self.verbs)
 
     @property
-    def enabled_verbs(self) -> Set[str]:
+    def enabled_verbs(self) -> Tuple[str, ...]:
         """verb fields, which are True."""
-        return set(
+        return tuple(
             verb
             for verb in self.verbs
-            if self.__dict__[verb]
+            if getattr(self, verb)
         )
 
 
+# Shared by generated permission schemas: Schema instances deepcopy their declared fields.
+_PERM_ID_FIELD = fields.Integer()
+_PERM_LISTGROUP_FIELD = fields.Nested("ListGroupSchema")
+
+# Generated permission tables and schemas, indexed by (table, field key, verbs).
+_PERM_TABLES: Dict[Tuple[Type['Base'], str, Tuple[str, ...]], Tuple[str, Type['Base']]] = {}
+_PERM_SCHEMAS: Dict[Tuple[Type['Base'], str, Tuple[str, ...]], Type[Schema]] = {}
+
+
+def _clone_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a permission lookup entry. 'from' chain is its only mutable field, extend this
+    explicitly should another one become mutable."""
+    return {'table': entry['table'], 'from': list(entry['from']), 'verbs': entry['verbs']}
+
+
 class PermissionLookupTables:
     """Holds lookup tables for group based access.
 
-    :param raw_permissions: Store rules for user defined permissions on hierarchical entities
-    :type raw_permissions: Dict
+    :param raw_tables: Tables declaring permissions, in registration order
+    :type raw_tables: List
+    :param raw_permissions: Store rules for user defined permissions on hierarchical entities,
+        parallel to raw_tables
+    :type raw_permissions: List
     :param permissions: Store processed permissions with hierarchical linkage info
     :type permissions: Dict
     :param login_required: Handle @login_required nested cases (create, read_nested)
@@ -195,7 +222,8 @@ class PermissionLookupTables:
     """
 
 
-    raw_permissions: ClassVar[Dict[str, Tuple[Type[Any], Tuple[Permission]]]] = {}
+    raw_tables: ClassVar[List[Type['Base']]] = []
+    raw_permissions: ClassVar[List[Tuple[Permission, ...]]] = []
     # permissions: ClassVar[PermissionLookupTables]
     permissions: ClassVar[Dict[Type['Base'], Any]] = {}
     login_required: ClassVar[Dict[Type['Base'], Any]] = {}
@@ -212,11 +240,9 @@ class PermissionLookupTables:
             for func in [f for _, f in getmembers(controller, predicate=ismethod)]:
                 # Populate LookupTables in case
                 if hasattr(func, 'login_required'):
-                    cls.login_required[table] = cls.login_required.get(table, [])
-                    cls.login_required[table].append(func.login_required)
+                    cls.login_required.setdefault(table, []).append(func.login_required)
                 if hasattr(func, 'group_required'):
-                    cls.group_required[table] = cls.group_required.get(table, {})
-                    cls.group_required[table].update(func.group_required)
+                    cls.group_required.setdefault(table, {}).update(func.group_required)
 
     @staticmethod
     def _gen_perm_table(app: 'Api', table: Type['Base'], fkey: str, verbs: List[str]):
@@ -255,13 +281,26 @@ class PermissionLookupTables:
         from biodm.components.services import CompositeEntityService
         from biodm.components.table import Base
 
-        new_asso_name = f"ASSO_PERM_{table.__name__.upper()}_{fkey.upper()}"
-        rel_name = f"perm_{fkey.lower()}"
-
-        columns: Dict[str, Column[Any] | MappedColumn[Any] | Relationship | Tuple[Any]] = {
-            f"{pk}_{table.__name__.lower()}": Column(primary_key=True)
-            for pk in table.pk
-        }
+        # Tables can only be declared once per MetaData, reuse on repeated setup.
+        key = (table, fkey, tuple(verbs))
+        if key in _PERM_TABLES:
+            rel_name, perm_table = _PERM_TABLES[key]
+            setattr(perm_table, 'svc', CompositeEntityService(app=app, table=perm_table))
+            return rel_name, perm_table
+
+        # Interned: those names end up as attribute, schema field and column keys.
+        new_asso_name = intern(f"ASSO_PERM_{table.__name__.upper()}_{fkey.upper()}")
+        rel_name = intern(f"perm_{fkey.lower()}")
+        tname_lower = table.__name__.lower()
+
+        # Single pass over primary keys: local columns and their remote references.
+        columns: Dict[str, Column[Any] | MappedColumn[Any] | Relationship | Tuple[Any]] = {}
+        local_cols, remote_cols = [], []
+        for pk in table.pk:
+            local = intern(f"{pk}_{tname_lower}")
+            local_cols.append(local)
+            remote_cols.append(f"{table.__tablename__}.{pk}")
+            columns[local] = Column(primary_key=True)
 
         columns['entity'] = relationship(
             table,
@@ -271,27 +310,14 @@ class PermissionLookupTables:
                 # all\{refresh-expire} + delete-orphan: important.
                 cascade="save-update, merge, delete, expunge, delete-orphan"
             ),
-            foreign_keys="[" + ",".join(
-                [
-                    f"{new_asso_name}.{key}"
-                    for key in columns.keys()
-                ]
-            ) + "]",
+            # Pass Column objects directly, spares SQLA from parsing a string expression.
+            foreign_keys=list(columns.values()),
             passive_deletes=True,
             single_parent=True,
         )
 
         columns['__table_args__'] = (
-            ForeignKeyConstraint(
-                [
-                    f"{pk}_{table.__name__.lower()}"
-                    for pk in table.pk
-                ],
-                [
-                    f"{table.__tablename__}.{pk}"
-                    for pk in table.pk
-                ],
-            ),
+            ForeignKeyConstraint(local_cols, remote_cols),
         )
 
         for verb in verbs:
@@ -312,6 +338,7 @@ class PermissionLookupTables:
         perm_table = type(new_asso_name, (Base,), columns)
         setattr(perm_table, 'svc', CompositeEntityService(app=app, table=perm_table))
 
+        _PERM_TABLES[key] = rel_name, perm_table
         return rel_name, perm_table
 
     @staticmethod
@@ -327,7 +354,11 @@ class PermissionLookupTables:
         :return: permission schema
         :rtype: Schema
         """
-        # Copy primary key columns from original table schema.
+        key = (table, fkey, tuple(verbs))
+        if key in _PERM_SCHEMAS:
+            return _PERM_SCHEMAS[key]
+
+        # Copy primary key columns from original table schema.
         schema_columns = {
             key: value
             for key, value in table.ctrl.schema.declared_fields.items()
@@ -336,19 +367,20 @@ class PermissionLookupTables:
         for verb in verbs:
             schema_columns.update(
                 {
-                    f"id_{verb}": fields.Integer(),
-                    f"{verb}": fields.Nested("ListGroupSchema"),
+                    f"id_{verb}": _PERM_ID_FIELD,
+                    f"{verb}": _PERM_LISTGROUP_FIELD,
                 }
             )
 
         # back reference - probably unwanted.
         # schema_columns['entity'] = fields.Nested(table.ctrl.schema)
 
-        return type(
+        _PERM_SCHEMAS[key] = type(
             f"AssoPerm{table.__name__.capitalize()}{fkey.capitalize()}Schema",
             (Schema,),
             schema_columns
         )
+        return _PERM_SCHEMAS[key]
 
     @staticmethod
     def walk_relationships(
@@ -361,7 +393,8 @@ class PermissionLookupTables:
         :type origin: Type[Base]
         :param field_chain: dot '.' separated field chain
         :type field_chain: str
-        :raises ImplementionError: wrong field name, not a relationship or wrong relationship type
+        :raises ImplementionError: wrong field name, not a relationship or wrong relationship type,
+            chain looping back onto a table it went through
         :return: Table chain and final table leading to that field
         :rtype: Tuple[List[Type[Base]], Type[Base]]
         """
@@ -381,6 +414,11 @@ class PermissionLookupTables:
                     "A.K.A 'composition' pattern."
                 )
             itable = rel.mapper.entity
+            if itable in table_chain:
+                raise ImplementionError(
+                    f"Permission chain {origin.__name__}.{field_chain} loops back onto "
+                    f"{itable.__name__}, only straight composition is supported."
+                )
         return table_chain, itable
 
     @classmethod
@@ -393,9 +431,21 @@ class PermissionLookupTables:
             - holds listgroup objects mapped to enabled verbs
                 - Set ref for Children controller
         """
-        cls.permissions = {}
-        for table, permissions in cls.raw_permissions.values():
+        lut: DefaultDict[Type['Base'], List[Dict[str, Any]]] = defaultdict(list)
+        # Memoize walks: permissions converging on a table tend to propagate the same chains.
+        walks: Dict[Tuple[Type['Base'], str], Tuple[List[Type['Base']], Type['Base']]] = {}
+
+        def walk(origin: Type['Base'], field_chain: str):
+            key = (origin, field_chain)
+            if key not in walks:
+                walks[key] = cls.walk_relationships(origin, field_chain)
+            return walks[key]
+
+        for table, permissions in zip(cls.raw_tables, cls.raw_permissions):
             for perm in permissions:
+                if not perm.any_enabled:
+                    continue
+
                 match perm.field:
                     case str():
                         field_fullkey = perm.field.lower().replace(".", "_")
@@ -403,40 +453,48 @@ class PermissionLookupTables:
                             tchain = []
                             target = table
                         else:
-                            tchain, target = cls.walk_relationships(table, perm.field)
+                            tchain, target = walk(table, perm.field)
                     case Relationship():
                         field_fullkey = perm.field.key
-                        tchain, target = cls.walk_relationships(table, perm.field.key)
+                        tchain, target = walk(table, perm.field.key)
 
-                if not perm.enabled_verbs:
-                    continue
+                # Evaluated once, shared by table, schema and lookup entry.
+                verbs = perm.enabled_verbs
 
-                if field_fullkey == 'self' and 'write' in perm.enabled_verbs:
+                if field_fullkey == 'self' and 'write' in verbs:
                     raise ImplementionError(
                         "Permissions on self should not be used in conjunction with WRITE verb."
                     )
 
                 # Declare permission table and associated schema.
-                perm_table = cls._gen_perm_table(app, table, field_fullkey, perm.enabled_verbs)
-                perm_schema = cls._gen_perm_schema(table, field_fullkey, perm.enabled_verbs)
-
-                # Set extra field onto associated schema.
-                table.ctrl.schema.fields.update({perm_table[0]: fields.Nested(perm_schema)})
-                table.ctrl.schema.load_fields.update({perm_table[0]: fields.Nested(perm_schema)})
-                table.ctrl.schema.dump_fields.update({perm_table[0]: fields.Nested(perm_schema)})
-
-                # Set up look up table for incomming requests.
-                entry = {'table': perm_table[1], 'from': tchain, 'verbs': perm.enabled_verbs}
-                cls.permissions[target] = cls.permissions.get(target, [])
-                cls.permissions[target].append(entry)
-
-                # Propagate:
-                for propag in perm.propagates_to:
-                    prop_entry = deepcopy(entry)
-                    prop_tchain, prop_target = cls.walk_relationships(target, propag)
+                perm_table = cls._gen_perm_table(app, table, field_fullkey, verbs)
+                perm_schema = cls._gen_perm_schema(table, field_fullkey, verbs)
+
+                # Set extra field onto associated schema, a single instance serves all three.
+                perm_field = {perm_table[0]: fields.Nested(perm_schema)}
+                table.ctrl.schema.fields.update(perm_field)
+                table.ctrl.schema.load_fields.update(perm_field)
+                table.ctrl.schema.dump_fields.update(perm_field)
+
+                # Set up look up table for incomming requests.
+                # Own copy of the chain: memoized walks are shared.
+                entry = {'table': perm_table[1], 'from': list(tchain), 'verbs': verbs}
+                lut[target].append(entry)
+
+                # Propagate: dict.fromkeys drops repeated chains while preserving order.
+                for propag in dict.fromkeys(perm.propagates_to):
+                    prop_tchain, prop_target = walk(target, propag)
+                    if prop_target in tchain:
+                        raise ImplementionError(
+                            f"Permission propagation {target.__name__}.{propag} loops back onto "
+                            f"{prop_target.__name__}, only straight composition is supported."
+                        )
+                    prop_entry = _clone_entry(entry)
                     prop_entry['from'].extend(prop_tchain)
-                    cls.permissions[prop_target] = cls.permissions.get(prop_target, [])
-                    cls.permissions[prop_target].append(prop_entry)
+                    lut[prop_target].append(prop_entry)
+
+        # Plain dict: lookups at runtime should not insert missing tables.
+        cls.permissions = dict(lut)
 
     @classmethod
     def setup_permissions(cls, app: 'Api'):
@@ -447,5 +505,7 @@ class PermissionLookupTables:
         i.e. You should not flag an o2m with the same target from two different parent classes else
         that resource will likely be locked from any access.
         """
+        # Permissions are registered as mappers get configured.
+        configure_mappers()
         cls._setup_static_permissions(app=app)
         cls._setup_dynamic_permissions(app=app)
@@ -10,6 +10,12 @@ if TYPE_CHECKING:
     from biodm.components.services import DatabaseService
 
 
+# Backend flags, evaluated once: DATABASE_URL is fixed for the lifetime of the process.
+_DATABASE_URL = str(config.DATABASE_URL).lower()
+IS_POSTGRES = 'postgresql' in _DATABASE_URL
+IS_SQLITE = 'sqlite' in _DATABASE_URL
+
+
 def _backend_specific_insert() -> Callable[[_DMLTableArgument], Insert]:
     """Returns an insert statement builder according to DB backend.
 
@@ -18,10 +24,10 @@ def _backend_specific_insert() -> Callable[[_DMLTableArgument], Insert]:
     MariaDB/InnoDB have similar constructs, in case we want to support more backends
     the to_stmt method from the UpsertStmtValuesHolder class below should be tweaked as well.
     """
-    if 'postgresql' in str(config.DATABASE_URL).lower():
+    if IS_POSTGRES:
         return postgresql.insert
 
-    if 'sqlite' in str(config.DATABASE_URL).lower():
+    if IS_SQLITE:
         return sqlite.insert
 
     raise # Should not happen. Here to suppress linters.
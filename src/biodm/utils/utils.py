@@ -5,8 +5,7 @@ from functools import reduce, update_wrapper
 import operator
 from os import path, utime
 from typing import (
-    Any, List, Callable, Tuple, TypeVar, Dict, Iterator, Self, Generic,
-    MutableSet, Iterable, Sequence
+    Any, List, Callable, Tuple, TypeVar, Dict, Iterator, Self, Generic, Sequence
 )
 
 from starlette.responses import Response
@@ -36,11 +35,15 @@ class classproperty(Generic[_T]):
     """Descriptor combining @classmethod and @property behaviours for python v3.11+.
     notes: only implements the getter and memoizes for subsequent calls.
 
+    Result is stored directly onto the owner class under a sentinel key, so it lives and dies
+    with the class and inherited classes each compute their own.
+    type.__setattr__ is used to bypass declarative hooks, that would expire mapper memoizations.
+
     Inspired by: https://stackoverflow.com/a/76378416/6847689
     """
     def __init__(self, method: Callable[..., _T]) -> None:
         self.method = method
-        self.cache = {}
+        self.key = f"_cached_{method.__name__}"
 
         update_wrapper(self, method) # type: ignore [misc]
 
@@ -52,10 +55,12 @@ class classproperty(Generic[_T]):
         if cls is None:
             cls = type(slf)
 
-        if cls not in self.cache:
-            self.cache[cls] = self.method(cls)
-
-        return self.cache[cls]
+        try:
+            return cls.__dict__[self.key]
+        except KeyError:
+            value = self.method(cls)
+            type.__setattr__(cls, self.key, value)
+            return value
 
 
 def utcnow() -> dt.datetime:
@@ -68,9 +73,10 @@ def utcnow() -> dt.datetime:
 
 
 def json_response(data: Any, status_code: int) -> Response:
-    """Formats a Response object and set application/json header."""
+    """Formats a Response object and set application/json header.
+    Pre-encoded bytes are passed through as is."""
     return Response(
-        str(data) + "\n",
+        data + b"\n" if isinstance(data, bytes) else str(data) + "\n",
         status_code=status_code,
         media_type="application/json"
     )
@@ -139,35 +145,3 @@ def coalesce_dicts(ls: List[Dict[_T, _U]]) -> Dict[_T, _U]:
     """Assembles multiple dicts into one.
     - Overlapping keys: override value in order."""
     return reduce(operator.or_, ls, {})
-
-
-
-
-class OrderedSet(MutableSet[_T]):
-    """A set that preserves insertion order by internally using a dict.
-
-    courtesy of: https://stackoverflow.com/a/62019678/6847689
-    """
-    def __init__(self, iterable: Iterable[_T]):
-        self._d = dict.fromkeys(iterable)
-
-    def add(self, x: _T) -> None:
-        self._d[x] = None
-
-    def discard(self, x: _T) -> None:
-        self._d.pop(x, None)
-
-    def __contains__(self, x: object) -> bool:
-        return self._d.__contains__(x)
-
-    def __len__(self) -> int:
-        return self._d.__len__()
-
-    def __iter__(self) -> Iterator[_T]:
-        return self._d.__iter__()
-
-    def __str__(self):
-        return f"{{{', '.join(str(i) for i in self)}}}"
-
-    def __repr__(self):
-        return f"<OrderedSet {self}>"
@@ -0,0 +1,65 @@
+import asyncio
+
+import orjson
+import pytest
+
+from biodm import exceptions as exc
+from biodm.error import onerror
+
+
+def handle(error):
+    return asyncio.run(onerror(None, error))
+
+
+@pytest.mark.parametrize("error_class, status", [
+    (exc.FileTooLargeError,         400),
+    (exc.DataError,                 400),
+    (exc.EndpointError,             400),
+    (exc.PayloadJSONDecodingError,  400),
+    (exc.FailedRead,                404),
+    (exc.FailedUpdate,              404),
+    (exc.FailedDelete,              404),
+    (exc.InvalidCollectionMethod,   405),
+    (exc.UpdateVersionedError,      409),
+    (exc.FileNotUploadedError,      409),
+    (exc.ReleaseVersionError,       409),
+    (exc.PayloadEmptyError,         204),
+    (exc.TokenDecodingError,        503),
+    (exc.UnauthorizedError,         511),
+])
+def test_status(error_class, status):
+    """"""
+    response = handle(error_class("detail"))
+    assert response.status_code == status
+    assert orjson.loads(response.body)["code"] == status
+
+
+@pytest.mark.parametrize("error_class", [
+    exc.FailedCreate, exc.PartialIndex, exc.ManifestError, exc.MissingDB
+])
+def test_default_status(error_class):
+    """"""
+    response = handle(error_class("detail"))
+    assert response.status_code == 500
+    assert orjson.loads(response.body) == {
+        "code": 500, "reason": "Internal Server Error", "message": "detail"
+    }
+
+
+def test_server_error():
+    """"""
+    response = handle(ValueError("internal"))
+    assert response.status_code == 500
+    assert b"internal" not in response.body
+    assert handle(ValueError()).body == response.body
+    assert handle(ValueError()) is not response
+
+
+def test_unauthorized_error():
+    """"""
+    response = handle(exc.UnauthorizedError())
+    assert response.status_code == 511
+    assert orjson.loads(response.body)["message"] == "Authentication required."
+    assert orjson.loads(handle(exc.UnauthorizedError("No read access.")).body)["message"] == (
+        "No read access."
+    )
@@ -0,0 +1,281 @@
+import asyncio
+from time import time
+from unittest.mock import MagicMock
+
+import pytest
+from jwcrypto import jwk, jwt
+
+from biodm import exceptions as exc
+from biodm.managers import kcmanager
+from biodm.managers.kcmanager import KeycloakManager
+from biodm.utils.security import UserInfo
+
+
+class Clock:
+    """Settable replacement for time.time."""
+    def __init__(self):
+        self.now = 1000.
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def key():
+    return jwk.JWK.generate(kty='RSA', size=2048)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(kcmanager, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def jwt_options():
+    return {'verify_exp': True}
+
+
+@pytest.fixture
+def kc(monkeypatch, key, clock, jwt_options):
+    """KeycloakManager without Keycloak: admin calls are mocked."""
+    monkeypatch.setattr(kcmanager, '_OpenIDConnection', MagicMock())
+    monkeypatch.setattr(KeycloakManager, 'app', None, raising=False)
+    monkeypatch.setattr(KeycloakManager, 'logger', None, raising=False)
+    monkeypatch.setattr(UserInfo, 'kc', None, raising=False)
+    public_key = "".join(key.export_to_pem().decode().splitlines()[1:-1])
+    manager = KeycloakManager(
+        app=MagicMock(), host="http://keycloak.local", realm="test", public_key=public_key,
+        admin="admin", admin_password="admin", client_id="biodm", client_secret="secret",
+        jwt_options=jwt_options
+    )
+    manager.__dict__['admin'] = MagicMock()
+    return manager
+
+
+def sign(key, **claims):
+    token = jwt.JWT(header={'alg': 'RS256'}, claims=claims)
+    token.make_signed_token(key)
+    return token.serialize()
+
+
+def decode(kc, token):
+    return asyncio.run(kc.decode_token(token))
+
+
+def test_token_cached(kc, key, clock):
+    clock.now = time()
+    token = sign(key, sub='user', exp=int(clock.now) + 60)
+    claims = decode(kc, token)
+    assert claims['sub'] == 'user'
+    assert decode(kc, token) is claims
+
+
+def test_token_cache_expiry(kc, key, clock):
+    clock.now = time()
+    token = sign(key, sub='user', exp=int(clock.now) + 60)
+    claims = decode(kc, token)
+    clock.now += 60
+    # Verified again past cached expiry.
+    assert decode(kc, token) is not claims
+
+
+def test_token_expired(kc, key):
+    with pytest.raises(exc.TokenDecodingError):
+        decode(kc, sign(key, sub='user', exp=int(time()) - 3600))
+
+
+def test_token_without_expiry(kc, key):
+    with pytest.raises(exc.TokenDecodingError):
+        decode(kc, sign(key, sub='user'))
+
+
+@pytest.mark.parametrize("jwt_options", [{'verify_exp': False}])
+def test_token_expiry_unchecked(kc, key, clock):
+    clock.now = time()
+    assert decode(kc, sign(key, sub='user'))['sub'] == 'user'
+    token = sign(key, sub='user', exp=int(clock.now) - 3600)
+    claims = decode(kc, token)
+    clock.now += kcmanager.TOKEN_CACHE_TTL - 1
+    assert decode(kc, token) is claims
+    clock.now += 1
+    # Cached for at most TOKEN_CACHE_TTL, exp is not trusted.
+    assert decode(kc, token) is not claims
+
+
+@pytest.mark.parametrize("token", ["", "not.a.token", "a.b.c"])
+def test_token_invalid(kc, token):
+    with pytest.raises(exc.TokenDecodingError):
+        decode(kc, token)
+
+
+def test_token_wrong_key(kc):
+    other = jwk.JWK.generate(kty='RSA', size=2048)
+    with pytest.raises(exc.TokenDecodingError):
+        decode(kc, sign(other, sub='user', exp=int(time()) + 60))
+    assert not kc._token_cache
+
+
+def test_token_cache_eviction(kc, key, clock, monkeypatch):
+    monkeypatch.setattr(kcmanager, 'TOKEN_CACHE_SIZE', 2)
+    clock.now = time()
+    tokens = [sign(key, sub=f'user{i}', exp=int(clock.now) + 60) for i in range(3)]
+    first = decode(kc, tokens[0])
+    decode(kc, tokens[1])
+    assert decode(kc, tokens[0]) is first # Refreshed: tokens[1] is least recently used.
+    decode(kc, tokens[2])
+    assert len(kc._token_cache) == 2
+    assert decode(kc, tokens[0]) is first
+
+
+class Fetch:
+    """Stubbed lookup, counting calls."""
+    def __init__(self, value=None):
+        self.value = value
+        self.calls = 0
+
+    async def __call__(self, key):
+        self.calls += 1
+        return None if self.value is None else dict(self.value, key=key)
+
+
+def lookup(kc, fetch, kind='user', key='u1'):
+    return asyncio.run(kc._cached_lookup(kind, key, fetch))
+
+
+def test_lookup_cached(kc):
+    fetch = Fetch({'id': '1'})
+    assert lookup(kc, fetch) == {'id': '1', 'key': 'u1'}
+    assert lookup(kc, fetch) == {'id': '1', 'key': 'u1'}
+    assert fetch.calls == 1
+
+
+def test_lookup_returns_copy(kc):
+    fetch = Fetch({'id': '1'})
+    lookup(kc, fetch)['id'] = '2'
+    assert lookup(kc, fetch)['id'] == '1'
+
+
+def test_lookup_ttl_expiry(kc, clock):
+    fetch = Fetch({'id': '1'})
+    lookup(kc, fetch)
+    clock.now += kcmanager.LOOKUP_TTL - 1
+    lookup(kc, fetch)
+    assert fetch.calls == 1
+    clock.now += 1
+    lookup(kc, fetch)
+    assert fetch.calls == 2
+
+
+def test_lookup_miss_ttl(kc, clock):
+    fetch = Fetch()
+    assert lookup(kc, fetch) is None
+    assert lookup(kc, fetch) is None
+    assert fetch.calls == 1
+    clock.now += kcmanager.LOOKUP_MISS_TTL
+    lookup(kc, fetch)
+    assert fetch.calls == 2
+
+
+def test_lookup_eviction(kc, monkeypatch):
+    monkeypatch.setattr(kcmanager, 'LOOKUP_CACHE_SIZE', 2)
+    fetch = Fetch({'id': '1'})
+    for key in ('u1', 'u2', 'u3'):
+        lookup(kc, fetch, key=key)
+    assert len(kc._lookup_cache) == 2
+    assert ('user', 'u1') not in kc._lookup_cache
+    lookup(kc, fetch, key='u3')
+    assert fetch.calls == 3
+    lookup(kc, fetch, key='u1')
+    assert fetch.calls == 4
+
+
+@pytest.mark.parametrize("write, args", [
+    ('create_user', ({'username': 'u1'},)),
+    ('update_user', ('id', {'username': 'u1'})),
+    ('delete_user', ('id',)),
+])
+def test_lookup_invalidated_on_user_write(kc, write, args):
+    fetch = Fetch({'id': '1'})
+    lookup(kc, fetch)
+    lookup(kc, fetch, kind='group', key='g1')
+    asyncio.run(getattr(kc, write)(*args))
+    lookup(kc, fetch)
+    lookup(kc, fetch, kind='group', key='g1')
+    assert fetch.calls == 3
+
+
+@pytest.mark.parametrize("write, args", [
+    ('create_group', ('g1',)),
+    ('update_group', ('id', {'name': 'g1'})),
+    ('delete_group', ('id',)),
+])
+def test_lookup_invalidated_on_group_write(kc, write, args):
+    fetch = Fetch({'id': '1'})
+    for kind in ('group', 'group_name', 'group_path'):
+        lookup(kc, fetch, kind=kind, key='g1')
+    lookup(kc, fetch)
+    asyncio.run(getattr(kc, write)(*args))
+    for kind in ('group', 'group_name', 'group_path'):
+        lookup(kc, fetch, kind=kind, key='g1')
+    lookup(kc, fetch)
+    assert fetch.calls == 7
+
+
+class GatedFetch(Fetch):
+    """Stubbed lookup, blocking until released."""
+    def __init__(self, value=None):
+        super().__init__(value)
+        self.gate = asyncio.Event()
+
+    async def __call__(self, key):
+        self.calls += 1
+        await self.gate.wait()
+        return None if self.value is None else dict(self.value, key=key)
+
+
+def test_lookup_single_flight(kc):
+    async def run():
+        fetch = GatedFetch({'id': '1'})
+        callers = [asyncio.ensure_future(kc._cached_lookup('user', 'u1', fetch)) for _ in range(5)]
+        await asyncio.sleep(0)
+        fetch.gate.set()
+        results = await asyncio.gather(*callers)
+        assert fetch.calls == 1
+        assert all(r == {'id': '1', 'key': 'u1'} for r in results)
+        assert not kc._inflight
+
+    asyncio.run(run())
+
+
+def test_lookup_cancelled_caller(kc):
+    async def run():
+        fetch = GatedFetch({'id': '1'})
+        first = asyncio.ensure_future(kc._cached_lookup('user', 'u1', fetch))
+        second = asyncio.ensure_future(kc._cached_lookup('user', 'u1', fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        fetch.gate.set()
+        assert await second == {'id': '1', 'key': 'u1'}
+        assert first.cancelled()
+        assert fetch.calls == 1
+        assert ('user', 'u1') in kc._lookup_cache
+
+    asyncio.run(run())
+
+
+def test_lookup_invalidated_in_flight(kc):
+    async def run():
+        fetch = GatedFetch({'id': '1'})
+        caller = asyncio.ensure_future(kc._cached_lookup('user', 'u1', fetch))
+        await asyncio.sleep(0)
+        kc._invalidate('user')
+        fetch.gate.set()
+        assert await caller == {'id': '1', 'key': 'u1'}
+        assert ('user', 'u1') not in kc._lookup_cache
+        await kc._cached_lookup('user', 'u1', fetch)
+        assert fetch.calls == 2
+
+    asyncio.run(run())
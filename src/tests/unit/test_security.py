@@ -0,0 +1,57 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import marshmallow as ma
+import sqlalchemy as sa
+from sqlalchemy.orm import relationship
+
+from biodm.components import Base
+from biodm.components.services import CompositeEntityService
+from biodm.utils.security import Permission, PermissionLookupTables
+
+
+def test_setup_permissions(monkeypatch):
+    """"""
+    for name in ('raw_tables', 'raw_permissions'):
+        monkeypatch.setattr(PermissionLookupTables, name, [])
+    for name in ('permissions', 'login_required', 'group_required'):
+        monkeypatch.setattr(PermissionLookupTables, name, {})
+    # Generated tables services set those class wide, restored after the test.
+    for name in ('app', 'logger'):
+        monkeypatch.setattr(CompositeEntityService, name, None, raising=False)
+
+    class Lab(Base):
+        id = sa.Column(sa.Integer, primary_key=True)
+        studies = relationship("Study", back_populates="lab")
+        __permissions__ = (
+            Permission("studies", read=True, write=True, propagates_to=["samples"]),
+            Permission("studies"),
+        )
+
+    class Study(Base):
+        id = sa.Column(sa.Integer, primary_key=True)
+        id_lab = sa.Column(sa.ForeignKey("LAB.id"))
+        lab = relationship(Lab, back_populates="studies")
+        samples = relationship("Sample", back_populates="study")
+
+    class Sample(Base):
+        id = sa.Column(sa.Integer, primary_key=True)
+        id_study = sa.Column(sa.ForeignKey("STUDY.id"))
+        study = relationship(Study, back_populates="samples")
+
+    class LabSchema(ma.Schema):
+        id = ma.fields.Integer()
+
+    Lab.ctrl = SimpleNamespace(schema=LabSchema())
+    PermissionLookupTables.setup_permissions(MagicMock(controllers=[]))
+
+    assert PermissionLookupTables.raw_tables == [Lab]
+    perm_table = PermissionLookupTables.permissions[Study][0]['table']
+    assert perm_table.__name__ == "ASSO_PERM_LAB_STUDIES"
+    assert PermissionLookupTables.permissions == {
+        Study: [{'table': perm_table, 'from': [Lab], 'verbs': ('read', 'write')}],
+        Sample: [{'table': perm_table, 'from': [Lab, Study], 'verbs': ('read', 'write')}],
+    }
+    assert 'perm_studies' in Lab.dyn_relationships()
+    assert 'perm_studies' in Lab.ctrl.schema.fields
+    assert set(perm_table.__table__.c.keys()) == {'id_lab', 'id_read', 'id_write'}
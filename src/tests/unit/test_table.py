@@ -0,0 +1,44 @@
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.orm import relationship
+
+from biodm.components import Base, Versioned
+from biodm.utils.security import Permission, PermissionLookupTables
+
+
+def test_lookup_configures_mappers(monkeypatch):
+    """"""
+    monkeypatch.setattr(PermissionLookupTables, 'raw_tables', [])
+    monkeypatch.setattr(PermissionLookupTables, 'raw_permissions', [])
+    permissions = (Permission('self'),)
+
+    class E(Base):
+        id = sa.Column(sa.Integer, primary_key=True)
+        __permissions__ = permissions
+
+    assert PermissionLookupTables.raw_tables == []
+
+    # Configures pending mappers on first access.
+    assert E.is_autoincrement('id')
+    assert PermissionLookupTables.raw_tables == [E]
+    assert PermissionLookupTables.raw_permissions == [permissions]
+
+
+def test_col():
+    """"""
+    class F(Versioned, Base):
+        id = sa.Column(sa.Integer, primary_key=True)
+        x = sa.Column(sa.Integer, nullable=True)
+        g = relationship("G", back_populates="f")
+
+    class G(Base):
+        id = sa.Column(sa.Integer, primary_key=True)
+        f_id = sa.Column(sa.Integer)
+        f_version = sa.Column(sa.Integer)
+        f = relationship(F, back_populates="g")
+        __table_args__ = (sa.ForeignKeyConstraint([f_id, f_version], [F.id, F.version]),)
+
+    assert F.col('version') is F.__table__.c['version']
+    assert F.col('x') is F.__table__.c['x']
+    with pytest.raises(KeyError):
+        F.col('g')